@@ -4,17 +4,24 @@ Sample Python web application for Docker MCP and GitHub MCP integration testing.
 """
 
 import os
+import sys
 import time
+import functools
+import gzip
+import hashlib
 import json
 import logging
 from datetime import datetime
-from flask import Flask, jsonify, render_template_string
+from html import escape
+import gevent
+import orjson
+from flask import Flask, Response, request
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
-# Configure logging
+# Configure logging; timestamps come from gunicorn/the container runtime
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=logging.WARNING,
+    format='%(levelname)s %(name)s %(message)s'
 )
 logger = logging.getLogger(__name__)
 
@@ -25,146 +32,292 @@ app = Flask(__name__)
 REQUEST_COUNT = Counter('app_requests_total', 'Total requests', ['method', 'endpoint'])
 REQUEST_DURATION = Histogram('app_request_duration_seconds', 'Request duration')
 
+# Per-endpoint children bound once so flushes skip the labels() lookup
+ENDPOINT_REQUESTS = {
+    endpoint: REQUEST_COUNT.labels(method='GET', endpoint=endpoint)
+    for endpoint in ('/', '/health', '/api/info', '/api/test')
+}
+
+# Handlers tally requests here without taking the Prometheus metric lock;
+# a background greenlet (and every metrics refresh) flushes the tallies into
+# ENDPOINT_REQUESTS. The unlocked `+= 1` is only safe because gevent workers
+# run greenlets on one OS thread; a threaded server would lose increments.
+REQUEST_FLUSH_INTERVAL = 0.1
+pending_requests = dict.fromkeys(ENDPOINT_REQUESTS, 0)
+flushed_request_total = 0
+
+# Deployment settings, fixed for the process lifetime
+BRANCH_NAME = os.getenv('BRANCH_NAME', 'main')
+APP_ENV = os.getenv('APP_ENV', 'development')
+CONTAINER_ID = os.getenv('HOSTNAME', 'unknown')
+
 # Application metrics
 app_start_time = time.time()
-request_count = 0
 
-@app.before_request
-def before_request():
-    global request_count
-    request_count += 1
+# /api/info fields are fixed for the process lifetime, so serialize them once
+# and leave the object open for the per-request current_time field
+API_INFO_PREFIX = orjson.dumps({
+    'app_name': 'Docker MCP Integration Test',
+    'version': '1.0.0',
+    'branch': BRANCH_NAME,
+    'environment': APP_ENV,
+    'container_id': CONTAINER_ID,
+    'python_version': sys.version,
+    'start_time': app_start_time
+})[:-1]
+
+# /health has a fixed shape, so it is formatted straight into bytes
+HEALTH_TEMPLATE = b'{"status":"healthy","timestamp":"%s","uptime":%r,"version":"1.0.0"}'
+
+# /api/test likewise has a fixed shape
+API_TEST_TEMPLATE = b'{"test":"success","message":"API is working correctly","timestamp":"%s","random_number":%d}'
+
+# Error bodies never change, so serialize them once
+NOT_FOUND_BODY = orjson.dumps({'error': 'Not found'})
+INTERNAL_ERROR_BODY = orjson.dumps({'error': 'Internal server error'})
+
+# Home page clock values, refreshed out of band by a background greenlet;
+# home() refreshes them itself when they are stale (e.g. no greenlet running)
+CLOCK_REFRESH_INTERVAL = 1.0
+cached_current_time = ''
+cached_uptime = 0.0
+clock_refreshed_at = 0.0  # time.monotonic() of the last refresh
+
+# Prometheus exposition, regenerated out of band instead of at scrape time;
+# metrics() regenerates it itself when it is stale (e.g. no greenlet running)
+METRICS_REFRESH_INTERVAL = 1.0
+metrics_snapshot = None  # (payload, gzipped payload, etag, time.monotonic() of generation)
+
+# Simulated processing delay for /api/test in seconds (0 disables it)
+SIMULATED_LATENCY = float(os.getenv('SIMULATED_LATENCY', '0.1'))
+
+# Home page, split into static bytes around the per-request status block
+HOME_PREFIX = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Docker MCP Integration Test App</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .container { max-width: 800px; margin: 0 auto; }
+        .status { padding: 20px; background: #f0f8ff; border-radius: 5px; }
+        .metric { margin: 10px 0; }
+        .success { color: #28a745; }
+        .info { color: #17a2b8; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🐳 Docker MCP Integration Test App</h1>
+        <div class="status">
+            <h2>Application Status</h2>
+""".encode()
+
+HOME_STATUS = """\
+            <div class="metric success">✅ Status: Running</div>
+            <div class="metric info">🕐 Current Time: {current_time}</div>
+            <div class="metric info">⏱️ Uptime: {uptime:.2f} seconds</div>
+            <div class="metric info">📊 Total Requests: {request_count}</div>
+"""
+
+# Branch and environment are fixed, so they are escaped once as part of the suffix
+HOME_SUFFIX = f"""\
+            <div class="metric info">🌿 Branch: {escape(BRANCH_NAME)}</div>
+            <div class="metric info">🔧 Environment: {escape(APP_ENV)}</div>
+        </div>
+        
+        <h2>Available Endpoints</h2>
+        <ul>
+            <li><a href="/health">Health Check</a></li>
+            <li><a href="/metrics">Prometheus Metrics</a></li>
+            <li><a href="/api/info">API Info</a></li>
+            <li><a href="/api/test">API Test</a></li>
+        </ul>
+        
+        <h2>Integration Features</h2>
+        <ul>
+            <li>🐳 Docker containerization with health checks</li>
+            <li>📊 Prometheus metrics collection</li>
+            <li>🔧 Multi-stage Docker build</li>
+            <li>🌐 Nginx reverse proxy support</li>
+            <li>📈 Performance monitoring</li>
+            <li>🔄 GitHub MCP integration ready</li>
+        </ul>
+    </div>
+</body>
+</html>
+""".encode()
+
+@functools.lru_cache(maxsize=1)
+def _iso_timestamp(millis):
+    return datetime.fromtimestamp(millis / 1000).isoformat(timespec='milliseconds')
+
+def iso_now():
+    """Current time as an ISO 8601 string, computed at most once per millisecond."""
+    return _iso_timestamp(int(time.time() * 1000))
+
+def refresh_clock():
+    """Recompute the cached current time and uptime."""
+    global cached_current_time, cached_uptime, clock_refreshed_at
+    cached_current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    cached_uptime = time.time() - app_start_time
+    clock_refreshed_at = time.monotonic()
+
+def flush_request_counts():
+    """Move the pending per-endpoint tallies into the Prometheus counters."""
+    global flushed_request_total
+    for endpoint, child in ENDPOINT_REQUESTS.items():
+        count = pending_requests[endpoint]
+        if count:
+            # Subtract rather than reset so concurrent increments are kept
+            pending_requests[endpoint] -= count
+            flushed_request_total += count
+            child.inc(count)
+
+def refresh_metrics():
+    """Regenerate the cached metrics payload with its gzip body and ETag."""
+    global metrics_snapshot
+    flush_request_counts()
+    payload = generate_latest()
+    metrics_snapshot = (
+        payload,
+        gzip.compress(payload, compresslevel=1),
+        hashlib.blake2b(payload, digest_size=8).hexdigest(),
+        time.monotonic()
+    )
+
+def _run_every(interval, func):
+    while True:
+        gevent.sleep(interval)
+        func()
+
+def start_background_tasks():
+    """Spawn greenlets that refresh cached values ahead of requests (gevent only)."""
+    gevent.spawn(_run_every, CLOCK_REFRESH_INTERVAL, refresh_clock)
+    gevent.spawn(_run_every, METRICS_REFRESH_INTERVAL, refresh_metrics)
+    gevent.spawn(_run_every, REQUEST_FLUSH_INTERVAL, flush_request_counts)
+
+refresh_clock()
+refresh_metrics()
+
+def total_requests():
+    """Sum of the requests counted by the instrumented endpoints."""
+    return flushed_request_total + sum(pending_requests.values())
 
 @app.route('/')
 def home():
     """Home page with application info."""
-    REQUEST_COUNT.labels(method='GET', endpoint='/').inc()
+    pending_requests['/'] += 1
     
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    uptime = time.time() - app_start_time
+    if time.monotonic() - clock_refreshed_at >= CLOCK_REFRESH_INTERVAL:
+        refresh_clock()
     
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Docker MCP Integration Test App</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; }
-            .container { max-width: 800px; margin: 0 auto; }
-            .status { padding: 20px; background: #f0f8ff; border-radius: 5px; }
-            .metric { margin: 10px 0; }
-            .success { color: #28a745; }
-            .info { color: #17a2b8; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🐳 Docker MCP Integration Test App</h1>
-            <div class="status">
-                <h2>Application Status</h2>
-                <div class="metric success">✅ Status: Running</div>
-                <div class="metric info">🕐 Current Time: {{ current_time }}</div>
-                <div class="metric info">⏱️ Uptime: {{ "%.2f"|format(uptime) }} seconds</div>
-                <div class="metric info">📊 Total Requests: {{ request_count }}</div>
-                <div class="metric info">🌿 Branch: {{ branch_name }}</div>
-                <div class="metric info">🔧 Environment: {{ environment }}</div>
-            </div>
-            
-            <h2>Available Endpoints</h2>
-            <ul>
-                <li><a href="/health">Health Check</a></li>
-                <li><a href="/metrics">Prometheus Metrics</a></li>
-                <li><a href="/api/info">API Info</a></li>
-                <li><a href="/api/test">API Test</a></li>
-            </ul>
-            
-            <h2>Integration Features</h2>
-            <ul>
-                <li>🐳 Docker containerization with health checks</li>
-                <li>📊 Prometheus metrics collection</li>
-                <li>🔧 Multi-stage Docker build</li>
-                <li>🌐 Nginx reverse proxy support</li>
-                <li>📈 Performance monitoring</li>
-                <li>🔄 GitHub MCP integration ready</li>
-            </ul>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return render_template_string(
-        html_template,
-        current_time=current_time,
-        uptime=uptime,
-        request_count=request_count,
-        branch_name=os.getenv('BRANCH_NAME', 'main'),
-        environment=os.getenv('APP_ENV', 'development')
+    status = HOME_STATUS.format(
+        current_time=cached_current_time,
+        uptime=cached_uptime,
+        request_count=total_requests()
     )
+    
+    return Response(HOME_PREFIX + status.encode() + HOME_SUFFIX, mimetype='text/html')
+
+def health_body():
+    """Count a /health request and build its JSON body."""
+    pending_requests['/health'] += 1
+    
+    return HEALTH_TEMPLATE % (iso_now().encode(), time.time() - app_start_time)
 
 @app.route('/health')
 def health():
     """Health check endpoint."""
-    REQUEST_COUNT.labels(method='GET', endpoint='/health').inc()
-    
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'uptime': time.time() - app_start_time,
-        'version': '1.0.0'
-    })
+    return Response(health_body(), mimetype='application/json')
 
 @app.route('/metrics')
 def metrics():
     """Prometheus metrics endpoint."""
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    if time.monotonic() - metrics_snapshot[3] >= METRICS_REFRESH_INTERVAL:
+        refresh_metrics()
+    payload, gzipped, etag, _ = metrics_snapshot
+    
+    if request.accept_encodings['gzip']:
+        response = Response(gzipped, content_type=CONTENT_TYPE_LATEST)
+        response.headers['Content-Encoding'] = 'gzip'
+        etag += '-gzip'
+    else:
+        response = Response(payload, content_type=CONTENT_TYPE_LATEST)
+    
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    # Answers a matching If-None-Match with 304 Not Modified
+    return response.make_conditional(request)
+
+def api_info_body():
+    """Count an /api/info request and build its JSON body."""
+    pending_requests['/api/info'] += 1
+    
+    return API_INFO_PREFIX + b',"current_time":' + orjson.dumps(time.time()) + b'}'
+
+def api_test_body():
+    """Count an /api/test request and build its JSON body."""
+    pending_requests['/api/test'] += 1
+    
+    # Simulate some processing; gevent.sleep yields to other greenlets
+    if SIMULATED_LATENCY:
+        gevent.sleep(SIMULATED_LATENCY)
+    
+    return API_TEST_TEMPLATE % (iso_now().encode(), int(time.time() * 1000) % 1000)
 
 @app.route('/api/info')
 def api_info():
     """API information endpoint."""
-    REQUEST_COUNT.labels(method='GET', endpoint='/api/info').inc()
-    
-    return jsonify({
-        'app_name': 'Docker MCP Integration Test',
-        'version': '1.0.0',
-        'branch': os.getenv('BRANCH_NAME', 'main'),
-        'environment': os.getenv('APP_ENV', 'development'),
-        'container_id': os.getenv('HOSTNAME', 'unknown'),
-        'python_version': os.sys.version,
-        'start_time': app_start_time,
-        'current_time': time.time()
-    })
+    return Response(api_info_body(), mimetype='application/json')
 
 @app.route('/api/test')
 def api_test():
     """API test endpoint for integration testing."""
-    REQUEST_COUNT.labels(method='GET', endpoint='/api/test').inc()
-    
-    # Simulate some processing
-    time.sleep(0.1)
-    
-    return jsonify({
-        'test': 'success',
-        'message': 'API is working correctly',
-        'timestamp': datetime.now().isoformat(),
-        'random_number': int(time.time() * 1000) % 1000
-    })
+    return Response(api_test_body(), mimetype='application/json')
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
-    return jsonify({'error': 'Not found'}), 404
+    return Response(NOT_FOUND_BODY, 404, mimetype='application/json')
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     logger.error(f"Internal error: {error}")
-    return jsonify({'error': 'Internal server error'}), 500
+    return Response(INTERNAL_ERROR_BODY, 500, mimetype='application/json')
 
-if __name__ == '__main__':
-    port = int(os.getenv('PORT', 8000))
-    debug = os.getenv('APP_ENV', 'development') == 'development'
-    
-    logger.info(f"Starting application on port {port}")
-    logger.info(f"Environment: {os.getenv('APP_ENV', 'development')}")
-    logger.info(f"Branch: {os.getenv('BRANCH_NAME', 'main')}")
-    
-    app.run(host='0.0.0.0', port=port, debug=debug)
+class FastPathMiddleware:
+    """WSGI middleware answering fixed-shape JSON GETs before Flask's routing.
+
+    Matching requests skip the request context, URL matching and view dispatch;
+    everything else (including HEAD/OPTIONS on the same paths) goes to Flask.
+    """
+
+    def __init__(self, wsgi_app, routes):
+        self.wsgi_app = wsgi_app
+        self.routes = routes
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] == 'GET':
+            build_body = self.routes.get(environ.get('PATH_INFO'))
+            if build_body is not None:
+                try:
+                    body = build_body()
+                    status = '200 OK'
+                except Exception:
+                    logger.exception("Exception on %s [GET]", environ.get('PATH_INFO'))
+                    body = INTERNAL_ERROR_BODY
+                    status = '500 Internal Server Error'
+                start_response(status, [
+                    ('Content-Type', 'application/json'),
+                    ('Content-Length', str(len(body)))
+                ])
+                return [body]
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = FastPathMiddleware(app.wsgi_app, {
+    '/health': health_body,
+    '/api/info': api_info_body,
+    '/api/test': api_test_body
+})
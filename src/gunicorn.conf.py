@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for the Docker MCP integration application.
+
+Run with: gunicorn --config gunicorn.conf.py wsgi:app
+"""
+
+import os
+
+# Server socket
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Worker processes: a single gevent worker by default. prometheus_client runs
+# in single-process mode, so with several workers each one exports its own
+# counters and /metrics depends on which worker answers the scrape.
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+worker_class = 'gevent'
+worker_connections = 1000
+keepalive = 5
+
+# Logging: no per-request access log lines
+accesslog = None
+
+
+def when_ready(server):
+    """Log startup information once the master is ready."""
+    server.log.info(f"Starting application on {bind} with {workers} {worker_class} workers")
+    server.log.info(f"Environment: {os.getenv('APP_ENV', 'development')}")
+    server.log.info(f"Branch: {os.getenv('BRANCH_NAME', 'main')}")
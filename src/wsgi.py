@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+WSGI entrypoint for running the application under Gunicorn with gevent workers.
+"""
+
+# Patch the standard library before anything else is imported so blocking
+# calls (time.sleep, sockets) yield to other greenlets.
+from gevent import monkey
+monkey.patch_all()
+
+from app import app, start_background_tasks  # noqa: E402
+
+start_background_tasks()
+
+__all__ = ['app']
@@ -127,6 +127,107 @@ class TestAppUnit(unittest.TestCase):
             self.assertTrue(hasattr(app, 'app'))
         except ImportError as e:
             self.fail(f"Failed to import app: {e}")
+    
+    def _client(self):
+        import sys
+        import os
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+        import app
+        return app.app.test_client()
+    
+    def test_metrics_gzip(self):
+        """Test metrics are gzip-compressed when the client accepts it."""
+        import gzip
+        client = self._client()
+        response = client.get('/metrics', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn(b'app_requests_total', gzip.decompress(response.data))
+    
+    def test_fast_path_skips_routing(self):
+        """Test /api/info is answered without Flask's view dispatch."""
+        client = self._client()
+        import app
+        with patch.object(app.app, 'full_dispatch_request') as dispatch:
+            response = client.get('/api/info')
+        dispatch.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('current_time', response.json)
+    
+    def test_health_fast_path(self):
+        """Test /health is answered on the fast path with valid JSON."""
+        client = self._client()
+        import app
+        with patch.object(app.app, 'full_dispatch_request') as dispatch:
+            response = client.get('/health')
+        dispatch.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        data = response.json
+        self.assertEqual(data['status'], 'healthy')
+        self.assertIsInstance(data['uptime'], float)
+    
+    def test_api_test_body(self):
+        """Test the hand-formatted /api/test body parses as JSON."""
+        client = self._client()
+        with patch('app.SIMULATED_LATENCY', 0):
+            response = client.get('/api/test')
+        self.assertEqual(response.status_code, 200)
+        data = response.json
+        self.assertEqual(data['test'], 'success')
+        self.assertIsInstance(data['random_number'], int)
+    
+    def test_fast_path_error(self):
+        """Test fast path failures return the JSON 500 body."""
+        client = self._client()
+        with patch('app.API_INFO_PREFIX', None), self.assertLogs('app', 'ERROR') as logs:
+            response = client.get('/api/info')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json, {'error': 'Internal server error'})
+        self.assertIsNotNone(logs.records[0].exc_info)
+        self.assertIn('/api/info', logs.records[0].getMessage())
+    
+    def test_flush_request_counts(self):
+        """Test pending request tallies are flushed into the Prometheus counter."""
+        self._client()
+        import app
+        from prometheus_client import REGISTRY
+        labels = {'method': 'GET', 'endpoint': '/health'}
+        before = REGISTRY.get_sample_value('app_requests_total', labels)
+        total = app.total_requests()
+        app.pending_requests['/health'] += 2
+        app.flush_request_counts()
+        self.assertEqual(REGISTRY.get_sample_value('app_requests_total', labels), before + 2)
+        self.assertEqual(app.pending_requests['/health'], 0)
+        self.assertEqual(app.total_requests(), total + 2)
+    
+    def test_home_refreshes_stale_clock(self):
+        """Test the home page refreshes its clock without the background greenlet."""
+        client = self._client()
+        import app
+        app.clock_refreshed_at = time.monotonic() - app.CLOCK_REFRESH_INTERVAL
+        response = client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(app.clock_refreshed_at, time.monotonic() - app.CLOCK_REFRESH_INTERVAL)
+    
+    def test_metrics_etag(self):
+        """Test unchanged metrics answer If-None-Match with 304."""
+        client = self._client()
+        with patch('app.METRICS_REFRESH_INTERVAL', 3600):
+            response = client.get('/metrics')
+            etag = response.headers['ETag']
+            response = client.get('/metrics', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+    
+    def test_metrics_refresh_when_stale(self):
+        """Test /metrics regenerates a stale snapshot without the background greenlet."""
+        import re
+        client = self._client()
+        pattern = r'app_requests_total\{endpoint="/api/info",method="GET"\} ([0-9.]+)'
+        with patch('app.METRICS_REFRESH_INTERVAL', 0):
+            before = float(re.search(pattern, client.get('/metrics').text).group(1))
+            client.get('/api/info')
+            after = float(re.search(pattern, client.get('/metrics').text).group(1))
+        self.assertEqual(after, before + 1)
 
 def run_tests():
     """Run all tests and return results."""